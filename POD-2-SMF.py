@@ -4,93 +4,201 @@ POD → SMF Extractor
 Author: Johnny Shumway (JShum00)
 
 Purpose:
-    Stream-extracts individual .SMF models from a .POD file used in Terminal Reality games.
+    Extracts individual .SMF models from a memory-mapped .POD file used in Terminal Reality games.
     Each SMF chunk begins with 'C3DModel' and ends before the next one.
-    When a texture line is found (e.g. 'GMCJimmy_bump.TIF'), the file is renamed accordingly.
+    When a texture line is found (e.g. 'GMCJimmy_bump.TIF'), the file is named accordingly.
 
 Usage:
-    python pod_smf_extract.py <input_pod> <output_dir>
+    python pod_smf_extract.py [-v|--verbose] <input_pod> <output_dir>
+
+    Pass -v/--verbose to list every extracted model, not just the summary.
 """
 
-from io import BufferedWriter
+import mmap
+import os
+import re
+import sys
+from collections.abc import Iterator
+from io import BufferedReader, BufferedWriter
 from pathlib import Path
 
 
-def extract_smfs_from_pod(pod_path: str, output_dir: str) -> None:
-    """Extracts SMF models from a POD file into the specified output directory."""
+ChunkBuffer = bytes | bytearray | mmap.mmap
+
+_CHUNK_MARKER_RE = re.compile(rb"C3DModel")
+_STREAM_BLOCK_SIZE = 1 << 20
+
+
+def _find_chunk_starts(buf: ChunkBuffer) -> list[int]:
+    """Return the offsets of every line whose stripped content is `C3DModel`."""
+    starts: list[int] = []
+    for match in _CHUNK_MARKER_RE.finditer(buf):
+        # Only whole-line markers delimit models; the tag may also show up
+        # inside other data, so check what surrounds each hit.
+        line_start = buf.rfind(b"\n", 0, match.start()) + 1
+        line_end = buf.find(b"\n", match.end())
+        if line_end == -1:
+            line_end = len(buf)
+        if not buf[line_start:match.start()].strip() and not buf[match.end():line_end].strip():
+            starts.append(line_start)
+    return starts
+
+
+def _iter_mapped_chunks(mm: mmap.mmap) -> Iterator[tuple[ChunkBuffer, int, int]]:
+    """Yield `(buffer, start, end)` for every SMF chunk in a mapped archive."""
+    with mm:
+        starts = _find_chunk_starts(mm)
+        # Each chunk runs up to the next marker line, the last one to EOF.
+        for start, end in zip(starts, starts[1:] + [len(mm)]):
+            yield mm, start, end
+
+
+def _iter_streamed_chunks(pod_file: BufferedReader) -> Iterator[tuple[ChunkBuffer, int, int]]:
+    """Yield `(buffer, start, end)` for every SMF chunk, reading 1 MB blocks."""
+    chunk: bytearray | None = None  # stays None until the first marker line
+    carry = bytearray()
+    while True:
+        block = pod_file.read(_STREAM_BLOCK_SIZE)
+        # Only scan complete lines so a marker is never split across blocks;
+        # the partial tail is carried into the next read. Blocks without a
+        # newline extend the carried line in place, so long newline-free
+        # regions are copied and scanned once rather than once per block.
+        if block:
+            cut = block.rfind(b"\n") + 1
+            if not cut:
+                carry += block
+                continue
+            carry += block[:cut]
+            lines, carry = carry, bytearray(block[cut:])
+        else:
+            lines = carry
+
+        pos = 0
+        for start in _find_chunk_starts(lines):
+            if chunk is not None:
+                chunk += lines[pos:start]
+                yield chunk, 0, len(chunk)
+            chunk = bytearray()
+            pos = start
+        if chunk is not None:
+            chunk += lines[pos:]
+
+        if not block:
+            break
+
+    if chunk is not None:
+        yield chunk, 0, len(chunk)
+
+
+def _model_name_for_chunk(buf: ChunkBuffer, start: int, end: int) -> str | None:
+    """Derive a model name from the chunk's `<MODEL>_bump.TIF` reference, if any."""
+    # Many models include `<MODEL>_bump.TIF`, which is good enough to replace
+    # the placeholder name with something meaningful. The last reference in a
+    # chunk wins, matching the names the old rename-as-you-go loop produced.
+    bump_pos = buf.rfind(b"_bump.TIF", start, end)
+    if bump_pos == -1:
+        return None
+
+    # The name is whatever precedes the first `_` on that line once leading
+    # whitespace and quotes are dropped, so slice it out without decoding
+    # the whole line.
+    line_start = buf.rfind(b"\n", 0, bump_pos) + 1
+    prefix = buf[line_start:bump_pos].lstrip().lstrip(b'"')
+    model_name = prefix.partition(b"_")[0]
+    try:
+        return model_name.decode("utf-8")
+    except UnicodeDecodeError:
+        print(f"[!] Warning: Could not decode model name while naming SMF: {model_name!r}")
+        return None
+
+
+def _copy_chunk(pod_file: BufferedReader, buf: ChunkBuffer, out_file: BufferedWriter, start: int, end: int) -> None:
+    """Copy `[start, end)` of a chunk buffer into `out_file`, in-kernel when possible."""
+    offset = start
+    # A mapped buffer mirrors the archive on disk, so it can go fd-to-fd.
+    if isinstance(buf, mmap.mmap) and hasattr(os, "sendfile"):
+        try:
+            while offset < end:
+                sent = os.sendfile(out_file.fileno(), pod_file.fileno(), offset, end - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            # Some platforms only accept sockets as the sendfile target.
+            pass
+    if offset < end:
+        with memoryview(buf) as view:
+            out_file.write(view[offset:end])
+
+
+def extract_smfs_from_pod(pod_path: str, output_dir: str, verbose: bool = False) -> None:
+    """Extracts SMF models from a POD file into the specified output directory.
+
+    Per-model progress lines are only reported when `verbose` is set, and are
+    written in one batch after extraction instead of one print per model.
+    """
     pod_path = Path(pod_path)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     smf_count = 0
-    current_file: BufferedWriter | None = None
-    current_path: Path | None = None
+    written_names: set[str] = set()
+    log: list[str] = []
 
     print(f"[*] Extracting SMFs from: {pod_path}")
     print(f"[*] Output directory: {output_dir}\n")
 
     with pod_path.open("rb") as pod_file:
-        # Stream the archive instead of loading it wholesale; POD files can be large.
-        for raw_line in pod_file:
-            stripped = raw_line.strip()
-
-            # Start of a new SMF
-            if stripped == b"C3DModel":
-                if current_file is not None:
-                    assert current_path is not None
-                    current_file.close()
-                    smf_count += 1
-                    print(f"[+] Finished SMF #{smf_count:04d}: {current_path.name}")
-
-                # Start with a stable placeholder filename and rename later if
-                # the SMF exposes a better texture-derived model name.
-                filename = f"smf_{smf_count:04d}.smf"
-                current_path = output_dir / filename
-                current_file = current_path.open("wb")
-                print(f"[*] Started new SMF → {current_path.name}")
-
-            if current_file is not None:
-                assert current_path is not None
-                current_file.write(raw_line)
-
-                # Many models include `<MODEL>_bump.TIF`, which is good enough
-                # to promote the placeholder name into something meaningful.
-                if b"_bump.TIF" in stripped:
-                    try:
-                        text = stripped.decode("utf-8").strip('"')
-                        model_name = text.split("_")[0]
-                        new_path = output_dir / f"{model_name}.smf"
-
-                        if new_path != current_path:
-                            current_file.close()
-                            current_path.rename(new_path)
-                            print(f"[↻ ] Renamed: {current_path.name} → {new_path.name}")
-                            current_path = new_path
-                            current_file = current_path.open("ab")
-
-                    except UnicodeDecodeError:
-                        print(f"[!] Warning: Could not decode line while renaming: {stripped!r}")
-                    except Exception as exc:
-                        print(f"[!] Warning: Failed to rename SMF: {exc}")
-
-        # finalize
-        if current_file is not None:
-            assert current_path is not None
-            current_file.close()
+        # Map the archive instead of iterating it line by line; POD files can
+        # be large and the marker search is much cheaper on one flat buffer.
+        # Empty files cannot be mapped and huge ones may not fit a 32-bit
+        # address space, so those are read in fixed-size blocks instead.
+        try:
+            mm = mmap.mmap(pod_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            chunks = _iter_streamed_chunks(pod_file)
+        else:
+            chunks = _iter_mapped_chunks(mm)
+
+        for buf, start, end in chunks:
+            # The whole chunk is already in memory, so resolve its final name
+            # up front and open the destination exactly once.
+            placeholder = f"smf_{smf_count:04d}.smf"
+            model_name = _model_name_for_chunk(buf, start, end)
+            filename = placeholder if model_name is None else f"{model_name}.smf"
+            if filename in written_names:
+                # Several models can share a texture; keep the earlier file.
+                print(f"[!] Warning: {filename} already extracted, keeping {placeholder}")
+                filename = placeholder
+            written_names.add(filename)
+
+            # Write under a temporary name and publish with one os.replace,
+            # which also overwrites leftovers from earlier runs on Windows.
+            current_path = output_dir / filename
+            temp_path = output_dir / f"{filename}.part"
+            if verbose:
+                log.append(f"[*] Started new SMF → {current_path.name}\n")
+            with temp_path.open("wb") as current_file:
+                _copy_chunk(pod_file, buf, current_file, start, end)
+            os.replace(temp_path, current_path)
+
             smf_count += 1
-            print(f"[+] Finished SMF #{smf_count:04d}: {current_path.name}")
+            if verbose:
+                log.append(f"[+] Finished SMF #{smf_count:04d}: {current_path.name}\n")
+
+    sys.stdout.write("".join(log))
 
     print(f"\n[✓] Extraction complete. {smf_count} SMFs written from {pod_path.name} → {output_dir}")
 
 
 def main():
-    import sys
-
-    if len(sys.argv) != 3:
-        print("Usage: python pod_smf_extract.py <pod_file> <output_directory>")
+    args = [arg for arg in sys.argv[1:] if arg not in ("-v", "--verbose")]
+    if len(args) != 2:
+        print("Usage: python pod_smf_extract.py [-v|--verbose] <pod_file> <output_directory>")
         return
 
-    extract_smfs_from_pod(sys.argv[1], sys.argv[2])
+    verbose = any(arg in ("-v", "--verbose") for arg in sys.argv[1:])
+    extract_smfs_from_pod(args[0], args[1], verbose=verbose)
 
 
 if __name__ == "__main__":
@@ -24,23 +24,29 @@ Controls:
   ESC: Quit viewer
 """
 
+import ctypes
 import math
 import os
 from pathlib import Path
 import json
 import re
 import threading
+from typing import Callable
 
 import numpy as np
 import pygame
 from PIL import Image
 from OpenGL.GL import (
     GL_ALPHA_TEST,
+    GL_ARRAY_BUFFER,
     GL_BLEND,
     GL_COLOR_BUFFER_BIT,
+    GL_COMPILE,
     GL_DEPTH_BUFFER_BIT,
     GL_DEPTH_TEST,
+    GL_ELEMENT_ARRAY_BUFFER,
     GL_FILL,
+    GL_FLOAT,
     GL_FRONT_AND_BACK,
     GL_GREATER,
     GL_LINEAR,
@@ -52,37 +58,56 @@ from OpenGL.GL import (
     GL_QUADS,
     GL_RGBA,
     GL_SRC_ALPHA,
+    GL_STATIC_DRAW,
     GL_TEXTURE_2D,
+    GL_TEXTURE_COORD_ARRAY,
     GL_TEXTURE_MAG_FILTER,
     GL_TEXTURE_MIN_FILTER,
     GL_TRIANGLES,
     GL_UNSIGNED_BYTE,
+    GL_UNSIGNED_INT,
+    GL_VERTEX_ARRAY,
     glAlphaFunc,
     glBegin,
+    glBindBuffer,
     glBindTexture,
     glBlendFunc,
+    glBufferData,
+    glCallList,
     glClear,
     glClearColor,
     glColor3f,
     glColor4f,
+    glDeleteBuffers,
     glDeleteTextures,
     glDisable,
+    glDisableClientState,
+    glDrawArrays,
+    glDrawElements,
     glEnable,
+    glEnableClientState,
     glEnd,
+    glEndList,
+    glGenBuffers,
+    glGenLists,
     glGenTextures,
     glLoadIdentity,
     glMatrixMode,
+    glNewList,
     glOrtho,
     glPolygonMode,
     glPopMatrix,
     glPushMatrix,
     glRasterPos2f,
     glTexCoord2f,
+    glTexCoord2fv,
+    glTexCoordPointer,
     glTexImage2D,
     glTexParameteri,
     glTranslatef,
     glVertex2f,
-    glVertex3f,
+    glVertex3fv,
+    glVertexPointer,
     glViewport,
 )
 from OpenGL.GLU import gluLookAt, gluPerspective
@@ -130,6 +155,7 @@ from pysmf_gui_materials import (
 )
 from pysmf_gui_model import (
     PreparedSubmesh,
+    build_grid_line_vertices,
     compute_model_metrics,
     normalize_vector,
     prepare_submeshes,
@@ -182,13 +208,21 @@ class SMFViewer:
 
         self._configure_3d_viewport()
 
-        # Default OpenGL state
+        # Default OpenGL state. Depth, blend, and polygon mode are cached so
+        # per-frame passes only touch the driver when the state changes.
         glClearColor(0.1, 0.1, 0.1, 1.0)
-        glEnable(GL_DEPTH_TEST)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)  # start in wireframe mode
-
-        # UI hitboxes are rebuilt every frame because layout depends on window
-        # size, hover state, and which sidebar groups are expanded.
+        self._depth_test_on: bool | None = None
+        self._blend_on: bool | None = None
+        self._polygon_mode: int | None = None
+        self._set_depth_test(True)
+        self._set_polygon_mode(GL_LINE)  # start in wireframe mode
+        # Buffer objects are core since GL 1.5; older contexts keep using the
+        # immediate-mode submesh path.
+        self.vertex_buffers_supported = bool(glGenBuffers)
+
+        # Most UI hitboxes are rebuilt every frame because layout depends on
+        # hover state and which sidebar groups are expanded. Toolbar buttons
+        # only depend on the window width, so they are laid out on resize.
         self.button_labels: list[str] = ["Open", "Export", "Specs", "Settings", "Wireframe", "Texture", "Opacity", "Shading", "Shadows", "Exit"]
         self.button_display_labels: dict[str, str] = {
             "Open": "📂 Open",
@@ -217,6 +251,7 @@ class SMFViewer:
         self.toolbar_label_font: pygame.font.Font | None = self._load_toolbar_label_font()
         self.toolbar_label_texture_cache: dict[tuple[str, tuple[int, int, int]], tuple[int, int, int]] = {}
         self.buttons: list[tuple[int, int, int, int]] = []
+        self._layout_toolbar_buttons()
         self.hover_index: int | None = None
         self.mesh_row_rects: list[tuple[int, int, int, int]] = []
         self.mesh_eye_rects: list[tuple[int, int, int, int]] = []
@@ -308,6 +343,11 @@ class SMFViewer:
         self.inspector_status_message = "Tuple families drive preview roles. Field edits affect preview only."
         self._state_lock = threading.Lock()
         self._pending_model_load: PendingModelLoad | None = None
+        # Worker threads report results as (title, message) pairs that `run()`
+        # shows once no other modal is open.
+        self._pending_messages: list[tuple[str, str]] = []
+        # Bumped for every Open so an older parse that finishes late is dropped.
+        self._load_request_id = 0
         self.settings_path = Path(__file__).resolve().with_name("viewer_settings.json")
         self.viewer_settings = self._load_viewer_settings()
         self.settings_draft: ViewerSettings | None = None
@@ -333,6 +373,10 @@ class SMFViewer:
         self.shadow_y_offset = 0.03
         self.shadow_opacity = 0.22
         self.grid_y = -3.0
+        # The grid is static between model loads, so it is compiled into a
+        # display list and rebuilt only when its extent changes.
+        self.grid_display_list: int | None = None
+        self.grid_display_range: int | None = None
 
         # Orbit camera around the current model center using yaw/pitch.
         self.camera_radius = 20.0
@@ -345,6 +389,78 @@ class SMFViewer:
         self.camera_fast_zoom_step = 2.0
         self.camera_orbit_step = 1.0
         self.camera_pitch_step = 0.5
+        # The eye position is cached and only recomputed after the camera moves.
+        self.camera_eye: tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self.camera_eye_state: tuple[float, float, float] | None = None
+        self.camera_eye_center: np.ndarray | None = None
+
+    # -------------------------------------------------------------------------
+
+    def _update_hover_state(self, mx: int, my: int) -> None:
+        """Hit-test the pointer against the UI hitboxes from the last drawn frame."""
+        # Hover state is recomputed from scratch each frame rather than
+        # incrementally tracking overlapping hitboxes.
+        self.hover_index = None
+        self.hover_mesh_row_index = None
+        self.hover_mesh_eye_index = None
+        self.hover_group_header_index = None
+        self.hover_group_eye_index = None
+        self.hover_material_field_index = None
+        self.hover_specs_swatch_index = None
+        self.hover_inspector_tooltip = None
+        for i, (left, top, right, bottom) in enumerate(self.buttons):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_index = i
+                break
+        for i, (left, top, right, bottom) in enumerate(self.mesh_row_rects):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_mesh_row_index = self.mesh_row_indices[i]
+                break
+        for i, (left, top, right, bottom) in enumerate(self.mesh_eye_rects):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_mesh_eye_index = self.mesh_eye_indices[i]
+                break
+        for i, (left, top, right, bottom) in enumerate(self.group_header_rects):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_group_header_index = self.group_header_indices[i]
+                break
+        for i, (left, top, right, bottom) in enumerate(self.group_eye_rects):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_group_eye_index = self.group_header_indices[i]
+                break
+        for i, (left, top, right, bottom) in enumerate(self.material_field_rects):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_material_field_index = i
+                break
+        for i, (left, top, right, bottom) in enumerate(self.specs_swatch_rects):
+            if left <= mx <= right and top <= my <= bottom:
+                self.hover_specs_swatch_index = i
+                break
+        for i, (left, top, right, bottom) in enumerate(self.inspector_tooltip_rects):
+            if left <= mx <= right and top <= my <= bottom and i < len(self.inspector_tooltip_texts):
+                self.hover_inspector_tooltip = self.inspector_tooltip_texts[i]
+                break
+
+    # -------------------------------------------------------------------------
+
+    def _camera_eye_position(self) -> tuple[float, float, float]:
+        """Return the orbit camera position, recomputing it only when it changes."""
+        state = (self.camera_yaw_deg, self.camera_pitch_deg, self.camera_radius)
+        # `model_center` is replaced rather than mutated on load, so identity
+        # is enough to notice a new model.
+        if state != self.camera_eye_state or self.model_center is not self.camera_eye_center:
+            yaw = math.radians(self.camera_yaw_deg)
+            pitch = math.radians(self.camera_pitch_deg)
+            cx, cy, cz = self.model_center
+            cos_pitch = math.cos(pitch)
+            self.camera_eye = (
+                cx + self.camera_radius * cos_pitch * math.cos(yaw),
+                cy + self.camera_radius * math.sin(pitch),
+                cz + self.camera_radius * cos_pitch * math.sin(yaw),
+            )
+            self.camera_eye_state = state
+            self.camera_eye_center = self.model_center
+        return self.camera_eye
 
     # -------------------------------------------------------------------------
 
@@ -373,21 +489,30 @@ class SMFViewer:
 
     # -------------------------------------------------------------------------
 
-    def _project_shadow_vertex(self, vertex: np.ndarray, translate_y: float) -> np.ndarray:
-        """Project a local-space vertex onto the ground plane using the shadow direction."""
+    def _project_shadow_positions(self, positions: np.ndarray, translate_y: float) -> np.ndarray:
+        """Project local-space positions onto the ground plane using the shadow direction."""
         direction_y = float(self.shadow_direction[1])
         if abs(direction_y) <= 1e-8:
-            return vertex.astype(np.float32)
+            return np.ascontiguousarray(positions, dtype=np.float32)
 
-        world_y = float(vertex[1] + translate_y)
+        world_y = positions[:, 1] + translate_y
         target_y = self.grid_y + self.shadow_y_offset
         travel = (target_y - world_y) / direction_y
-        projected = vertex[:3] + self.shadow_direction * travel
-        return projected.astype(np.float32)
+        projected = positions + travel[:, np.newaxis] * self.shadow_direction
+        return np.ascontiguousarray(projected, dtype=np.float32)
 
     # -------------------------------------------------------------------------
 
-    def _draw_projected_ground_shadow(self, translate_y: float, render_roles: list[RenderRole]) -> None:
+    def _prepare_shadow_positions(self) -> None:
+        """Cache projected shadow positions; they only depend on the model center."""
+        translate_y = -float(self.model_center[1])
+        for prepared in self.prepared_submeshes:
+            if prepared.positions is not None:
+                prepared.shadow_positions = self._project_shadow_positions(prepared.positions, translate_y)
+
+    # -------------------------------------------------------------------------
+
+    def _draw_projected_ground_shadow(self, render_roles: list[RenderRole]) -> None:
         """Draw a simple projected shadow pass onto the ground plane."""
         if (
             self.model_data is None
@@ -398,27 +523,42 @@ class SMFViewer:
             return
 
         glDisable(GL_TEXTURE_2D)
-        glEnable(GL_BLEND)
+        self._set_blend(True)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         glColor4f(0.0, 0.0, 0.0, self.shadow_opacity)
 
-        for i, sm in enumerate(self.model_data["submeshes"]):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        for i, prepared in enumerate(self.prepared_submeshes):
             if i < len(self.submesh_visibility) and not self.submesh_visibility[i]:
                 continue
-            if render_roles[i] == "light_overlay" or not sm["vertices"]:
+            if render_roles[i] == "light_overlay":
                 continue
-            prepared = self.prepared_submeshes[i] if i < len(self.prepared_submeshes) else None
-            if prepared is None or prepared.positions is None:
+            if prepared.shadow_positions is None or prepared.indices is None or len(prepared.indices) == 0:
                 continue
-            glBegin(GL_TRIANGLES)
-            for face in sm["faces"]:
-                if len(face) != 3:
-                    continue
-                for vi in face:
-                    if 0 <= vi < len(prepared.positions):
-                        projected = self._project_shadow_vertex(prepared.positions[vi], translate_y)
-                        glVertex3f(float(projected[0]), float(projected[1]), float(projected[2]))
-            glEnd()
+            glVertexPointer(3, GL_FLOAT, 0, prepared.shadow_positions)
+            glDrawElements(GL_TRIANGLES, len(prepared.indices), GL_UNSIGNED_INT, prepared.indices)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    # -------------------------------------------------------------------------
+
+    def _draw_grid(self) -> None:
+        """Draw the ground grid, recompiling its display list only when resized."""
+        grid_range = int(max(10, self.model_size / 2))
+        if self.grid_display_list is None or grid_range != self.grid_display_range:
+            if self.grid_display_list is None:
+                self.grid_display_list = glGenLists(1)
+            endpoints = build_grid_line_vertices(grid_range, self.grid_y)
+            # Client-array state is not recorded in display lists, but the
+            # draw call copies the vertex data into the list when compiled.
+            glNewList(self.grid_display_list, GL_COMPILE)
+            glColor3f(0.0, 0.8, 1.0)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, endpoints)
+            glDrawArrays(GL_LINES, 0, len(endpoints))
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glEndList()
+            self.grid_display_range = grid_range
+        glCallList(self.grid_display_list)
 
     # -------------------------------------------------------------------------
 
@@ -736,7 +876,10 @@ class SMFViewer:
             return
 
         if purpose == "open_smf":
-            self._load_smf_from_path(selected_path)
+            with self._state_lock:
+                self._load_request_id += 1
+                request_id = self._load_request_id
+            self._start_background_task(self._load_smf_from_path, selected_path, request_id)
         elif purpose == "manual_trk":
             self._load_selected_trk(selected_path)
         elif purpose == "manual_texture":
@@ -748,7 +891,44 @@ class SMFViewer:
             self.active_settings_field = target_field or self.active_settings_field
         elif purpose == "export_obj":
             if self.last_loaded_path is not None:
-                export_to_obj(self.last_loaded_path, selected_path)
+                # Let an in-flight export finish writing even if the viewer exits.
+                self._start_background_task(self._export_obj_to_path, self.last_loaded_path, selected_path, daemon=False)
+
+    # -------------------------------------------------------------------------
+
+    def _start_background_task(self, target: Callable[..., object], *args: object, daemon: bool = True) -> None:
+        """Run slow file work on a worker thread so the render loop keeps drawing."""
+        threading.Thread(target=target, args=args, daemon=daemon).start()
+
+    # -------------------------------------------------------------------------
+
+    def _queue_message(self, title: str, message: str) -> None:
+        """Hand a message from a worker thread to the render loop."""
+        with self._state_lock:
+            self._pending_messages.append((title, message))
+
+    # -------------------------------------------------------------------------
+
+    def _show_pending_message(self) -> None:
+        """Show the oldest queued worker message once no other modal is open."""
+        if self.modal is not None:
+            return
+        with self._state_lock:
+            if not self._pending_messages:
+                return
+            title, message = self._pending_messages.pop(0)
+        self._open_message_modal(title, message)
+
+    # -------------------------------------------------------------------------
+
+    def _export_obj_to_path(self, smf_path: str, obj_path: str) -> None:
+        """Export an SMF as OBJ on a worker thread and report the outcome."""
+        try:
+            export_to_obj(smf_path, obj_path)
+        except Exception as exc:
+            self._queue_message("Export Failed", f"Could not export OBJ file:\n{obj_path}\n\n{exc}")
+        else:
+            self._queue_message("Export Complete", f"Exported OBJ file:\n{obj_path}")
 
     # -------------------------------------------------------------------------
 
@@ -911,6 +1091,56 @@ class SMFViewer:
 
     # -------------------------------------------------------------------------
 
+    def _set_depth_test(self, enabled: bool) -> None:
+        """Enable or disable depth testing only when the cached state differs."""
+        if self._depth_test_on == enabled:
+            return
+        if enabled:
+            glEnable(GL_DEPTH_TEST)
+        else:
+            glDisable(GL_DEPTH_TEST)
+        self._depth_test_on = enabled
+
+    # -------------------------------------------------------------------------
+
+    def _set_blend(self, enabled: bool) -> None:
+        """Enable or disable blending only when the cached state differs."""
+        if self._blend_on == enabled:
+            return
+        if enabled:
+            glEnable(GL_BLEND)
+        else:
+            glDisable(GL_BLEND)
+        self._blend_on = enabled
+
+    # -------------------------------------------------------------------------
+
+    def _set_polygon_mode(self, mode: int) -> None:
+        """Set the front/back polygon mode only when the cached mode differs."""
+        if self._polygon_mode == mode:
+            return
+        glPolygonMode(GL_FRONT_AND_BACK, mode)
+        self._polygon_mode = mode
+
+    # -------------------------------------------------------------------------
+
+    def _set_overlay_gl_state(self) -> None:
+        """Switch to the flat, blended state shared by all 2D overlays."""
+        self._set_depth_test(False)
+        self._set_blend(True)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        self._set_polygon_mode(GL_FILL)
+
+    # -------------------------------------------------------------------------
+
+    def _set_scene_gl_state(self) -> None:
+        """Restore the depth-tested state the 3D scene expects."""
+        self._set_depth_test(True)
+        self._set_blend(False)
+        self._set_polygon_mode(GL_LINE if self.wireframe else GL_FILL)
+
+    # -------------------------------------------------------------------------
+
     def _button_width(self, label: str) -> int:
         """Approximate button width for GLUT bitmap text."""
         width = max(110, 28 + len(label) * 11)
@@ -1058,6 +1288,26 @@ class SMFViewer:
         self.height = max(self.min_height, height)
         pygame.display.set_mode((self.width, self.height), DOUBLEBUF | OPENGL | RESIZABLE)
         self._configure_3d_viewport()
+        self._layout_toolbar_buttons()
+
+    # -------------------------------------------------------------------------
+
+    def _layout_toolbar_buttons(self) -> None:
+        """Compute toolbar button hitboxes for the current window width."""
+        self.buttons = []
+        top = 12
+        bottom = self.toolbar_height - 12
+
+        # Keep Exit separated on the far right so it behaves like a global action.
+        left = 16
+        for label in self.button_labels[:-1]:
+            right = left + self._button_width(label)
+            self.buttons.append((left, top, right, bottom))
+            left = right + 12
+
+        right = self.width - 16
+        left = right - (self._button_width(self.button_labels[-1]) + 18)
+        self.buttons.append((left, top, right, bottom))
 
     # -------------------------------------------------------------------------
 
@@ -1252,6 +1502,58 @@ class SMFViewer:
 
     # -------------------------------------------------------------------------
 
+    def _upload_submesh_buffers(self) -> None:
+        """Upload prepared submesh geometry into static vertex/index buffers."""
+        if not self.vertex_buffers_supported:
+            return
+
+        for prepared in self.prepared_submeshes:
+            if prepared.vertices is None or prepared.indices is None or len(prepared.indices) == 0:
+                continue
+            prepared.vertex_buffer = int(glGenBuffers(1))
+            glBindBuffer(GL_ARRAY_BUFFER, prepared.vertex_buffer)
+            glBufferData(GL_ARRAY_BUFFER, prepared.vertices.nbytes, prepared.vertices, GL_STATIC_DRAW)
+            prepared.index_buffer = int(glGenBuffers(1))
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, prepared.index_buffer)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, prepared.indices.nbytes, prepared.indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    # -------------------------------------------------------------------------
+
+    def _delete_submesh_buffers(self) -> None:
+        """Release the vertex/index buffers owned by the prepared submeshes."""
+        for prepared in self.prepared_submeshes:
+            if prepared.vertex_buffer is not None:
+                glDeleteBuffers(1, [prepared.vertex_buffer])
+                prepared.vertex_buffer = None
+            if prepared.index_buffer is not None:
+                glDeleteBuffers(1, [prepared.index_buffer])
+                prepared.index_buffer = None
+
+    # -------------------------------------------------------------------------
+
+    def _draw_submesh_buffers(self, prepared: PreparedSubmesh, textured: bool) -> None:
+        """Draw one uploaded submesh with a single `glDrawElements` call."""
+        assert prepared.vertices is not None and prepared.indices is not None
+        # Rows are interleaved `x, y, z, nx, ny, nz, u, v` float32 values.
+        stride = prepared.vertices.strides[0]
+        glBindBuffer(GL_ARRAY_BUFFER, prepared.vertex_buffer)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, stride, None)
+        if textured:
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glTexCoordPointer(2, GL_FLOAT, stride, ctypes.c_void_p(6 * prepared.vertices.itemsize))
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, prepared.index_buffer)
+        glDrawElements(GL_TRIANGLES, len(prepared.indices), GL_UNSIGNED_INT, None)
+        if textured:
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    # -------------------------------------------------------------------------
+
     def _clear_tinted_texture_variants(self) -> None:
         """Drop any cached tinted texture variants derived from the base texture."""
         self._delete_texture_handle(self.body_tinted_texture_id)
@@ -1489,15 +1791,12 @@ class SMFViewer:
     # -------------------------------------------------------------------------
 
     def _draw_toolbar(self) -> None:
-        """Render the persistent top toolbar and update button hitboxes."""
+        """Render the persistent top toolbar from the cached button layout."""
         toolbar_top = 0
         toolbar_bottom = self.toolbar_height
         toolbar_alpha = 0.95
 
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        self._set_overlay_gl_state()
 
         glViewport(0, 0, self.width, self.height)
         glMatrixMode(GL_PROJECTION)
@@ -1524,20 +1823,12 @@ class SMFViewer:
         glVertex2f(0, toolbar_bottom)
         glEnd()
 
-        self.buttons = []
-        top = 12
-        bottom = toolbar_bottom - 12
-
-        # Keep Exit separated on the far right so it behaves like a global action.
+        # Exit is the last button and sits apart on the far right.
         left_labels = self.button_labels[:-1]
         right_label = self.button_labels[-1]
-        left = 16
 
-        for label in left_labels:
-            width = self._button_width(label)
-            right = left + width
-            self.buttons.append((left, top, right, bottom))
-            button_index = len(self.buttons) - 1
+        for button_index, label in enumerate(left_labels):
+            left, top, right, bottom = self.buttons[button_index]
             enabled = self._is_button_enabled(label)
 
             if not enabled:
@@ -1568,13 +1859,9 @@ class SMFViewer:
             glEnd()
 
             self._draw_toolbar_label(left, top, right, bottom, label, enabled)
-            left = right + 12
 
-        right_width = self._button_width(right_label) + 18
-        right = self.width - 16
-        left = right - right_width
-        self.buttons.append((left, top, right, bottom))
-        button_index = len(self.buttons) - 1
+        button_index = len(left_labels)
+        left, top, right, bottom = self.buttons[button_index]
 
         if button_index == self.hover_index:
             glColor4f(0.34, 0.34, 0.34, 1.0)
@@ -1633,14 +1920,11 @@ class SMFViewer:
             glColor3f(0.96, 0.96, 0.96)
             self._draw_text(tooltip_left + 8, tooltip_top + 20, tooltip_text)
 
-        glDisable(GL_BLEND)
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
-        glEnable(GL_DEPTH_TEST)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE if self.wireframe else GL_FILL)
         self._configure_3d_viewport()
 
     # -------------------------------------------------------------------------
@@ -1703,10 +1987,7 @@ class SMFViewer:
         scrollbar_margin = 10
         row_width = self.sidebar_width - 28 - scrollbar_width - scrollbar_margin
 
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        self._set_overlay_gl_state()
 
         glViewport(0, 0, self.width, self.height)
         glMatrixMode(GL_PROJECTION)
@@ -1938,14 +2219,11 @@ class SMFViewer:
             self.sidebar_visible_height = max(0.0, list_bottom - list_top)
             self.sidebar_scroll_offset = 0.0
 
-        glDisable(GL_BLEND)
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
-        glEnable(GL_DEPTH_TEST)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE if self.wireframe else GL_FILL)
         self._configure_3d_viewport()
 
     # -------------------------------------------------------------------------
@@ -1960,10 +2238,7 @@ class SMFViewer:
         panel_inner_right = inspector_right - 16
         panel_width = panel_inner_right - panel_inner_left
 
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        self._set_overlay_gl_state()
 
         glViewport(0, 0, self.width, self.height)
         glMatrixMode(GL_PROJECTION)
@@ -2370,14 +2645,11 @@ class SMFViewer:
                     glVertex2f(track_left, thumb_bottom)
                     glEnd()
 
-        glDisable(GL_BLEND)
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
-        glEnable(GL_DEPTH_TEST)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE if self.wireframe else GL_FILL)
         self._configure_3d_viewport()
 
     # -------------------------------------------------------------------------
@@ -2387,10 +2659,7 @@ class SMFViewer:
         status_top = self.height - self.statusbar_height
         status_bottom = self.height
 
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        self._set_overlay_gl_state()
 
         glViewport(0, 0, self.width, self.height)
         glMatrixMode(GL_PROJECTION)
@@ -2421,14 +2690,11 @@ class SMFViewer:
         glColor3f(0.86, 0.86, 0.86)
         self._draw_text(16, status_top + 21, status_text)
 
-        glDisable(GL_BLEND)
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
-        glEnable(GL_DEPTH_TEST)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE if self.wireframe else GL_FILL)
         self._configure_3d_viewport()
 
     # -------------------------------------------------------------------------
@@ -2464,10 +2730,7 @@ class SMFViewer:
         if self.modal is None:
             return
 
-        glDisable(GL_DEPTH_TEST)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        self._set_overlay_gl_state()
 
         glViewport(0, 0, self.width, self.height)
         glMatrixMode(GL_PROJECTION)
@@ -2768,14 +3031,11 @@ class SMFViewer:
                     glColor3f(0.96, 0.96, 0.96)
                     self._draw_text(rect[0] + 18, rect[1] + 22, name)
 
-        glDisable(GL_BLEND)
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
         glMatrixMode(GL_PROJECTION)
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
-        glEnable(GL_DEPTH_TEST)
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE if self.wireframe else GL_FILL)
         self._configure_3d_viewport()
 
     # -------------------------------------------------------------------------
@@ -3090,12 +3350,15 @@ class SMFViewer:
         self.submesh_preview_states = []
         # Convert geometry to NumPy once so the render loop can reuse the same
         # arrays for shading, UV lookup, and projected shadows.
+        self._delete_submesh_buffers()
         self.prepared_submeshes = prepare_submeshes(
             self.model_data,
             self.light_direction,
             self.light_ambient,
             self.light_diffuse,
         )
+        self._upload_submesh_buffers()
+        self._prepare_shadow_positions()
         # Render roles, draw buckets, and texture-selection policy are cached
         # here so the frame loop does not have to reclassify every submesh.
         self._rebuild_render_metadata()
@@ -3140,7 +3403,6 @@ class SMFViewer:
                 {"start_dir": texture_prompt["start_dir"]},
             )
 
-        print_smf_summary(self.last_loaded_path)
         print(
             f"Loaded {pending['total_verts']} vertices and "
             f"{pending['total_faces']} faces from {self.last_loaded_path}"
@@ -3148,18 +3410,29 @@ class SMFViewer:
 
     # -------------------------------------------------------------------------
 
-    def _load_smf_from_path(self, path: str) -> None:
+    def _load_smf_from_path(self, path: str, request_id: int) -> None:
         """Parse and queue an SMF model from a chosen path."""
-        parser = SMFParser()
-        model_data = parser.parse(path)
-        texture_payload, texture_prompt = self._discover_texture_for_smf(path)
-        model_center, model_size, total_verts, total_faces = compute_model_metrics(model_data)
-        if total_verts == 0:
-            print(f"Warning: no vertex data found in {path}")
-
-        # File dialogs and parsing may happen away from the render loop; stash
-        # the result and let `run()` apply it on the next frame.
+        try:
+            model_data = SMFParser.parse_cached(path)
+            texture_payload, texture_prompt = self._discover_texture_for_smf(path)
+            model_center, model_size, total_verts, total_faces = compute_model_metrics(model_data)
+            if total_verts == 0:
+                print(f"Warning: no vertex data found in {path}")
+            print_smf_summary(path, model_data)
+        except Exception as exc:
+            with self._state_lock:
+                if request_id == self._load_request_id:
+                    self._pending_messages.append(
+                        ("SMF Load Failed", f"Could not load SMF file:\n{path}\n\n{exc}")
+                    )
+            return
+
+        # Parsing runs on a worker thread and must not touch GL or viewer
+        # state; stash the result and let `run()` apply it on the next frame.
+        # A newer Open may have started meanwhile, in which case it wins.
         with self._state_lock:
+            if request_id != self._load_request_id:
+                return
             self._pending_model_load = {
                 "path": path,
                 "model_data": model_data,
@@ -3182,7 +3455,7 @@ class SMFViewer:
     def toggle_wireframe(self) -> None:
         """Toggle polygon fill mode for the 3D scene."""
         self.wireframe = not self.wireframe
-        glPolygonMode(GL_FRONT_AND_BACK, GL_LINE if self.wireframe else GL_FILL)
+        self._set_polygon_mode(GL_LINE if self.wireframe else GL_FILL)
         print("Wireframe mode:", self.wireframe)
 
     # -------------------------------------------------------------------------
@@ -3235,9 +3508,11 @@ class SMFViewer:
 
         while running:
             self._apply_pending_model_load()
+            self._show_pending_message()
             self._configure_3d_viewport()
 
             # ---------------- Event handling ----------------
+            hover_pos: tuple[int, int] | None = None
             for event in pygame.event.get():
                 if event.type == QUIT:
                     running = False
@@ -3306,48 +3581,9 @@ class SMFViewer:
                         self._adjust_camera_pitch(-event.rel[1] * self.camera_pitch_step)
                     elif self.dragging_camera_orbit and event.rel[0] != 0:
                         self.camera_yaw_deg += math.copysign(self.camera_orbit_step, event.rel[0])
-                    # Hover state is recomputed from scratch each frame rather than
-                    # incrementally tracking overlapping hitboxes.
-                    self.hover_index = None
-                    self.hover_mesh_row_index = None
-                    self.hover_mesh_eye_index = None
-                    self.hover_group_header_index = None
-                    self.hover_group_eye_index = None
-                    self.hover_material_field_index = None
-                    self.hover_specs_swatch_index = None
-                    self.hover_inspector_tooltip = None
-                    for i, (left, top, right, bottom) in enumerate(self.buttons):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_index = i
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.mesh_row_rects):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_mesh_row_index = self.mesh_row_indices[i]
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.mesh_eye_rects):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_mesh_eye_index = self.mesh_eye_indices[i]
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.group_header_rects):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_group_header_index = self.group_header_indices[i]
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.group_eye_rects):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_group_eye_index = self.group_header_indices[i]
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.material_field_rects):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_material_field_index = i
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.specs_swatch_rects):
-                        if left <= mx <= right and top <= my <= bottom:
-                            self.hover_specs_swatch_index = i
-                            break
-                    for i, (left, top, right, bottom) in enumerate(self.inspector_tooltip_rects):
-                        if left <= mx <= right and top <= my <= bottom and i < len(self.inspector_tooltip_texts):
-                            self.hover_inspector_tooltip = self.inspector_tooltip_texts[i]
-                            break
+                    # Several motion events can arrive per frame; only the
+                    # final pointer position matters for hover hit-testing.
+                    hover_pos = event.pos
                 elif event.type == MOUSEBUTTONDOWN and event.button == 1:
                     mx, my = event.pos
                     if self._point_in_rect(mx, my, self.sidebar_scrollbar_thumb):
@@ -3526,6 +3762,9 @@ class SMFViewer:
                     elif event.key == K_h:
                         self.toggle_shadows()
 
+            if hover_pos is not None:
+                self._update_hover_state(*hover_pos)
+
             # ---------------- Continuous input ----------------
             # Camera motion is polled each frame so held keys feel continuous.
             if not self._modal_active():
@@ -3550,38 +3789,24 @@ class SMFViewer:
                     self._adjust_camera_zoom(self.camera_zoom_step)
 
             # ---------------- Camera setup ----------------
+            self._set_scene_gl_state()
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT) # pyright: ignore[reportOperatorIssue]
             glLoadIdentity()
 
-            yaw = math.radians(self.camera_yaw_deg)
-            pitch = math.radians(self.camera_pitch_deg)
-            cx, cy, cz = self.model_center
-            cos_pitch = math.cos(pitch)
-            eye_x = cx + self.camera_radius * cos_pitch * math.cos(yaw)
-            eye_y = cy + self.camera_radius * math.sin(pitch)
-            eye_z = cz + self.camera_radius * cos_pitch * math.sin(yaw)
+            eye_x, eye_y, eye_z = self._camera_eye_position()
 
             # The model is re-centered before drawing, so the orbit target stays fixed at the origin.
             gluLookAt(eye_x, eye_y, eye_z, 0, 0, 0, 0, 1, 0)
 
             # ---------------- Draw grid ----------------
-            glBegin(GL_LINES)
-            glColor3f(0.0, 0.8, 1.0)
-            grid_range = int(max(10, self.model_size / 2))
-            for x in range(-grid_range, grid_range + 1):
-                glVertex3f(x, self.grid_y, -grid_range)
-                glVertex3f(x, self.grid_y, grid_range)
-            for z in range(-grid_range, grid_range + 1):
-                glVertex3f(-grid_range, self.grid_y, z)
-                glVertex3f(grid_range, self.grid_y, z)
-            glEnd()
+            self._draw_grid()
 
             # ---------------- Draw model ----------------
             if self.model_data:
                 textured = self.texture_id is not None and self.show_texture and not self.wireframe
                 if textured:
                     glEnable(GL_TEXTURE_2D)
-                    glEnable(GL_BLEND)
+                    self._set_blend(True)
                     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
                 else:
                     glDisable(GL_TEXTURE_2D)
@@ -3602,7 +3827,7 @@ class SMFViewer:
 
                 # Fast textured shading uses one cached light factor per
                 # submesh, avoiding per-vertex Python color calls.
-                self._draw_projected_ground_shadow(translate_y, self.submesh_render_roles)
+                self._draw_projected_ground_shadow(self.submesh_render_roles)
                 if textured:
                     glEnable(GL_TEXTURE_2D)
 
@@ -3611,10 +3836,10 @@ class SMFViewer:
                         sm = self.model_data["submeshes"][i]
                         if i < len(self.submesh_visibility) and not self.submesh_visibility[i]:
                             continue
-                        if not sm["vertices"]:
+                        if len(sm["vertices"]) == 0:
                             continue
                         prepared = self.prepared_submeshes[i] if i < len(self.prepared_submeshes) else None
-                        if prepared is None or prepared.vertices is None:
+                        if prepared is None or prepared.vertices is None or prepared.indices is None:
                             continue
 
                         role = self.submesh_render_roles[i] if i < len(self.submesh_render_roles) else "opaque_neutral"
@@ -3636,25 +3861,28 @@ class SMFViewer:
                             glColor4f(shade, shade, shade, alpha)
                         elif not self.wireframe:
                             glColor4f(0.6 * shade, 0.8 * shade, 1.0 * shade, alpha)
+                        if prepared.index_buffer is not None:
+                            self._draw_submesh_buffers(prepared, textured)
+                            continue
+                        # Indices were range-checked when the model was prepared,
+                        # so the fallback loop needs no per-vertex guards.
+                        # Pass float32 row views straight through the vector
+                        # entry points instead of unpacking three Python floats.
                         glBegin(GL_TRIANGLES)
-                        for f in sm["faces"]:
-                            for vi in f:
-                                try:
-                                    if textured:
-                                        u = verts_np[vi][6]
-                                        v = verts_np[vi][7]
-                                        glTexCoord2f(u, v)
-                                    glVertex3f(*verts_np[vi][:3])
-                                except Exception:
-                                    continue
+                        for vi in prepared.indices:
+                            if textured:
+                                glTexCoord2fv(verts_np[vi, 6:8])
+                            glVertex3fv(verts_np[vi, :3])
                         glEnd()
                 glPopMatrix()
                 if textured:
                     glDisable(GL_ALPHA_TEST)
                     glBindTexture(GL_TEXTURE_2D, 0)
                     glDisable(GL_TEXTURE_2D)
-                    glDisable(GL_BLEND)
+                    self._set_blend(False)
 
+            # Overlays leave the flat 2D state in place; the scene state is
+            # restored once at the start of the next frame.
             self._draw_toolbar()
             self._draw_sidebar()
             self._draw_inspector()
@@ -5,15 +5,49 @@ Author: Johnny Shumway (jShum00)
 Parses Terminal Reality .SMF model files used in games like 4x4 Evolution 2.
 Extracts vertex data, face indices, texture references, and submesh structure.
 
-Each SMF file is read line-by-line with defensive parsing to handle small format variations.
+Each SMF file is read and scanned line-by-line as bytes with defensive parsing
+to handle small format variations. Only names and texture references are decoded.
+Geometry rows are collected per submesh and converted to float32 vertex and int32
+face arrays in one pass.
 The resulting data can be consumed by the SMF Viewer or exported to other 3D formats.
+`SMFParser.parse_cached` keeps pickled results in the user cache directory so that
+reopening an unchanged file skips parsing.
 """
 
+import hashlib
+import os
+import pickle
 import re
-from typing import TypedDict
+import tempfile
+from typing import Callable, TypedDict
 
-Vertex = list[float]
-Face = list[int]
+import numpy as np
+
+# Bounds used when narrowing parsed face indices to int32.
+_INT32_INFO = np.iinfo(np.int32)
+
+# Fields NumPy's separator parser reads as a number but `int()`/`float()`
+# reject: blank or sign-only fields, and a sign followed by whitespace.
+_LOOSE_FIELD_RE = re.compile(rb'(?:^|,)\s*[+-]?\s*(?:,|$)|[+-]\s')
+
+
+def _has_loose_fields(block: bytes) -> bool:
+    """Return True when a joined row block holds a field NumPy reads too loosely."""
+    # Stripped rows rarely contain whitespace, so the regex only runs on
+    # blocks that do; otherwise the only loose field is a bare sign.
+    if b" " in block or b"\t" in block or b"\x0b" in block or b"\x0c" in block:
+        return _LOOSE_FIELD_RE.search(block) is not None
+    return (
+        b",-," in block
+        or b",+," in block
+        or block.startswith((b"-,", b"+,"))
+        or block.endswith((b",-", b",+"))
+    )
+
+# Bump whenever parsing rules or the ParsedModel layout change so stale
+# cache entries are ignored.
+_PARSE_CACHE_VERSION = 2
+_PARSE_CACHE_MAX_ENTRIES = 32
 
 
 class SubmeshMaterial(TypedDict):
@@ -24,8 +58,8 @@ class SubmeshMaterial(TypedDict):
 
 class Submesh(TypedDict):
     name: str
-    vertices: list[Vertex]
-    faces: list[Face]
+    vertices: np.ndarray  # (n, 8) float32 rows
+    faces: np.ndarray     # (n, 3) int32 rows
     textures: list[str]
     vertex_count: int | None
     face_count: int | None
@@ -35,7 +69,7 @@ class Submesh(TypedDict):
 class ParsedModel(TypedDict):
     header: dict[str, str]
     version: int | None
-    vertices: list[Vertex]
+    vertices: np.ndarray  # (n, 8) rows from every submesh, in file order
     submeshes: list[Submesh]
     textures: list[str]
 
@@ -43,37 +77,72 @@ class ParsedModel(TypedDict):
 class SMFParser:
     """Parser for Terminal Reality .SMF files."""
 
-    # Submesh names in SMF files resemble identifiers; geometry rows do not.
-    _SUBMESH_NAME_RE: re.Pattern[str] = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
-    _VERTEX_MARKER_RE: re.Pattern[str] = re.compile(r'^v\d+$', re.IGNORECASE)
+    # Keyword lines are classified with a single full match, trying each
+    # alternative in order:
+    #   header - anything starting with the `C3DModel` tag
+    #   marker - mesh-section markers such as `v1`/`v2`, which stay metadata
+    #            within the current submesh instead of opening a new one
+    #   name   - identifier-like submesh names (e.g. "Body", "Wheel_01")
+    # Markers and names cannot contain commas, so geometry rows and count
+    # metadata never match.
+    _KEYWORD_LINE_RE: re.Pattern[bytes] = re.compile(
+        rb'(?P<header>C3DModel.*)|(?P<marker>[vV][0-9]+)|(?P<name>[A-Za-z][A-Za-z0-9_]*)'
+    )
+    # First bytes of version, count, vertex, and face rows.
+    _NUMERIC_START: bytes = b'0123456789+-.'
 
     def __init__(self) -> None:
         """Initialize storage for parsed model data."""
-        self.vertices: list[Vertex] = []   # global vertex list (all submeshes)
+        self.vertices: np.ndarray = np.empty((0, 8), dtype=np.float32)  # global vertex array (all submeshes)
         self.submeshes: list[Submesh] = []  # list of dicts, one per submesh
         self.textures: list[str] = []      # list of unique texture filenames
+        self._texture_set: set[str] = set()  # membership index for self.textures
         self.version: int | None = None    # SMF format version
         self.header: dict[str, str] = {}   # header info (e.g., C3DModel tag)
 
     # -------------------------------------------------------------------------
 
-    def _clean_tex(self, line: str) -> str:
+    def _read_lines(self, path: str) -> list[bytes]:
+        """
+        Return the stripped, non-empty lines of an SMF file as bytes.
+
+        Lines are split and stripped as bytes, so nothing is decoded into
+        `str` up front. `bytes.splitlines` breaks on the same CR/LF forms
+        as text-mode universal newlines.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        lines = [line for line in (raw.strip() for raw in data.splitlines()) if line]
+        if not data.isascii():
+            # Some game assets contain odd bytes. Drop anything that is not
+            # valid UTF-8 and strip again, as a text-mode read would, instead
+            # of failing the whole model load.
+            cleaned = (
+                line if line.isascii() else line.decode('utf-8', 'ignore').strip().encode('utf-8')
+                for line in lines
+            )
+            lines = [line for line in cleaned if line]
+        return lines
+
+    def _clean_tex(self, line: bytes) -> str:
         """
         Extract and clean texture filename from a line.
 
         Args:
-            line (str): A line containing a texture reference, e.g. `"GMCJimmy.TIF"`
+            line (bytes): A line containing a texture reference, e.g. `"GMCJimmy.TIF"`
 
         Returns:
             str: Cleaned texture filename.
         """
-        tex = line.replace('"', '').strip()
+        tex = line.decode('utf-8').replace('"', '').strip()
         tex = tex.split(',')[-1].strip()
         return tex
 
-    def _parse_material_line(self, line: str) -> SubmeshMaterial | None:
+    def _parse_material_line(self, line: bytes) -> SubmeshMaterial | None:
         """Parse a 5-value material line followed by a texture filename."""
-        parts = [part.strip().replace('"', '') for part in line.split(',')]
+        text = line.decode('utf-8')
+        parts = [part.strip().replace('"', '') for part in text.split(',')]
         if len(parts) < 6:
             return None
 
@@ -84,94 +153,132 @@ class SMFParser:
         return {
             "values": parts[:5],
             "texture": texture,
-            "raw_line": line,
+            "raw_line": text,
         }
 
-    def _is_submesh_name(self, line: str) -> bool:
+    def _add_texture(self, tex: str) -> None:
+        """Record a model-level texture once, preserving first-seen order."""
+        if tex not in self._texture_set:
+            self._texture_set.add(tex)
+            self.textures.append(tex)
+
+    @staticmethod
+    def _parse_rows(
+        rows: list[bytes],
+        width: int,
+        dtype: type,
+        convert: Callable[[str], float | int],
+    ) -> np.ndarray:
         """
-        Return True when a line looks like a valid submesh identifier.
+        Convert comma-separated geometry rows into a `(n, width)` array.
 
-        Valid names start with a letter and may continue with letters,
-        digits, or underscores. Comma-delimited lines are always rejected
-        to avoid matching geometry rows or count metadata. Vertex markers
-        such as `v1`/`v2` are excluded so they remain metadata within the
-        current submesh block instead of opening a new submesh record.
+        The whole block goes through NumPy's C parser at once. If any row
+        holds a value NumPy rejects, or a field it would read more loosely
+        than `convert` (blank or sign-only), the block is re-parsed row by
+        row and malformed rows are dropped, matching the old per-line
+        behavior.
         """
-        if ',' in line:
-            return False
-        if self._is_vertex_marker(line):
-            return False
-        return bool(self._SUBMESH_NAME_RE.fullmatch(line))
+        if rows:
+            block = b",".join(rows)
+            values = None
+            if not _has_loose_fields(block):
+                try:
+                    values = np.fromstring(block, dtype=dtype, sep=",")
+                except ValueError:
+                    pass
+            # Older NumPy releases stop early instead of raising, so also
+            # require exactly one value per field.
+            if values is not None and values.size == width * len(rows):
+                return values.reshape(-1, width)
+
+        parsed = []
+        for row in rows:
+            try:
+                parsed.append(np.array([convert(x) for x in row.decode('utf-8').split(',')], dtype=dtype))
+            except (ValueError, OverflowError):
+                continue
+        return np.array(parsed, dtype=dtype).reshape(-1, width)
 
-    def _is_vertex_marker(self, line: str) -> bool:
-        """Return True when a line is a mesh-section marker such as `v1`."""
-        return bool(self._VERTEX_MARKER_RE.fullmatch(line))
+    def _finish_submesh(self, submesh: Submesh, vert_rows: list[bytes], face_rows: list[bytes]) -> None:
+        """Convert a submesh's collected geometry rows and store the submesh."""
+        submesh["vertices"] = self._parse_rows(vert_rows, 8, np.float32, float)
+        # Faces are parsed wide and clamped before narrowing so an absurd
+        # index stays out of range instead of wrapping into a valid one.
+        faces = self._parse_rows(face_rows, 3, np.int64, int)
+        submesh["faces"] = np.clip(faces, _INT32_INFO.min, _INT32_INFO.max).astype(np.int32)
+        self.submeshes.append(submesh)
 
     # -------------------------------------------------------------------------
 
-    def parse(self, path: str) -> ParsedModel:
-        """
-        Parse an .SMF file into structured data.
-
-        Args:
-            path (str): Path to the SMF file.
-
-        Returns:
-            dict: A dictionary containing model metadata and geometry:
-                {
-                    "header": {...},
-                    "version": int,
-                    "vertices": [...],
-                    "submeshes": [...],
-                    "textures": [...]
-                }
-        """
-        self.vertices = []
-        self.submeshes = []
-        self.textures = []
-        self.version = None
-        self.header = {}
-
-        # Some game assets contain odd bytes, so parse defensively and ignore
-        # decode errors instead of failing the whole model load.
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = [ln.strip() for ln in f if ln.strip()]
+    def _parse_lines(self, lines: list[bytes]) -> None:
+        """Classify stripped SMF lines and fill the parser's model storage."""
+        # Hot-loop lookups are bound to locals once instead of per line.
+        line_count = len(lines)
+        match_keyword_line = self._KEYWORD_LINE_RE.fullmatch
+        add_texture = self._add_texture
+        numeric_start = self._NUMERIC_START
 
-        i = 0
         current_submesh: Submesh | None = None
-
-        while i < len(lines):
-            line = lines[i]
+        # Raw geometry rows for the current submesh; converted in bulk when
+        # the submesh ends.
+        vert_rows: list[bytes] = []
+        face_rows: list[bytes] = []
+        vert_rows_append = vert_rows.append
+        face_rows_append = face_rows.append
+        vertices_started = False
+        submesh_textures: set[str] = set()
+        # Lines before this index were already rejected as count rows for
+        # the current submesh.
+        count_scan_end = 0
+
+        # The version is the first all-digit line; it sits right after the
+        # header, so this scan stops within the first few lines and the main
+        # loop only needs an index comparison.
+        version_index = next((i for i, line in enumerate(lines) if line.isdigit()), None)
+        if version_index is not None:
+            self.version = int(lines[version_index])
+
+        for i, line in enumerate(lines):
+            # Rows that start like a number can only be the version, a
+            # texture/material row, or geometry, so only the other rows are
+            # matched against the keyword pattern.
+            numeric = line[0] in numeric_start
+            keyword = None
+            if not numeric:
+                match = match_keyword_line(line)
+                if match is not None:
+                    keyword = match.lastgroup
 
             # ---------------- Top-level header ----------------
-            if line.startswith("C3DModel"):
+            if keyword == "header":
                 self.header["type"] = "C3DModel"
-                i += 1
                 continue
 
             # ---------------- Version number ----------------
-            if self.version is None and line.isdigit():
-                try:
-                    self.version = int(line)
-                except ValueError:
-                    self.version = None
-                i += 1
+            if i == version_index:
                 continue
 
             # ---------------- Submesh block start ----------------
             # Submesh names are identifier-like tokens (e.g., "Body", "Wheel_01")
-            if self._is_submesh_name(line):
+            if keyword == "name":
                 if current_submesh:
-                    self.submeshes.append(current_submesh)
+                    self._finish_submesh(current_submesh, vert_rows, face_rows)
+                vert_rows = []
+                face_rows = []
+                vert_rows_append = vert_rows.append
+                face_rows_append = face_rows.append
+                vertices_started = False
+                submesh_textures = set()
+                count_scan_end = 0
 
                 # Many files store vertex/face counts a couple of rows after
                 # the submesh label, so probe nearby before parsing geometry.
                 look = i + 1
                 vertex_count: int | None = None
                 face_count: int | None = None
-                if look + 2 < len(lines):
+                if look + 2 < line_count:
                     candidate = lines[look + 2]
-                    parts = candidate.split(',')
+                    parts = candidate.decode('utf-8').split(',')
                     if len(parts) >= 4:
                         try:
                             vertex_count = int(parts[0])
@@ -180,25 +287,23 @@ class SMFParser:
                             vertex_count = face_count = None
 
                 current_submesh = {
-                    "name": line,
-                    "vertices": [],
-                    "faces": [],
+                    "name": line.decode('utf-8'),
+                    "vertices": np.empty((0, 8), dtype=np.float32),
+                    "faces": np.empty((0, 3), dtype=np.int32),
                     "textures": [],
                     "vertex_count": vertex_count,
                     "face_count": face_count,
                     "material": None,
                 }
-
-                i += 1
                 continue
 
             # ---------------- Vertex marker (v1, v2...) ----------------
-            if self._is_vertex_marker(line):
-                i += 1
+            if keyword == "marker":
                 continue
 
             # ---------------- Texture references (.TIF) ----------------
-            if ".TIF" in line.upper():
+            # `.upper()` only runs when a `.t`/`.T` pair could start a match.
+            if (b".T" in line or b".t" in line) and b".TIF" in line.upper():
                 tex = self._clean_tex(line)
                 if current_submesh:
                     material = self._parse_material_line(line)
@@ -207,80 +312,96 @@ class SMFParser:
                     # Texture/material metadata should appear before the vertex block.
                     # Once vertices start, later `.TIF` lines are not treated as
                     # canonical submesh texture assignments.
-                    if len(current_submesh["vertices"]) == 0 and tex:
-                        if tex not in current_submesh["textures"]:
+                    if not vertices_started and vert_rows:
+                        # Only rows that parse as vertices open the block.
+                        vertices_started = len(self._parse_rows(vert_rows, 8, np.float32, float)) > 0
+                    if not vertices_started and tex:
+                        if tex not in submesh_textures:
+                            submesh_textures.add(tex)
                             current_submesh["textures"].append(tex)
-                        if tex not in self.textures:
-                            self.textures.append(tex)
+                        add_texture(tex)
                 else:
-                    if tex and tex not in self.textures:
-                        self.textures.append(tex)
-                i += 1
+                    if tex:
+                        add_texture(tex)
                 continue
 
             # ---------------- Geometry (vertices or faces) ----------------
-            parts = line.split(',')
+            # Field counts come from the comma count; the row text itself is
+            # parsed in bulk when the submesh ends.
+            comma_count = line.count(b',')
 
             # Populate vertex/face count hints if missing
             if current_submesh and current_submesh["vertex_count"] is None and current_submesh["face_count"] is None:
                 # Some SMFs shift the count row around, so scan a small local
-                # window instead of relying on one fixed offset.
-                back_range = max(0, i - 6)
-                found_counts = False
-                for j in range(back_range, min(i + 3, len(lines))):
+                # window instead of relying on one fixed offset. The window
+                # slides with each line, so only its unscanned tail is checked.
+                scan_end = min(i + 3, line_count)
+                for j in range(max(count_scan_end, i - 6, 0), scan_end):
                     cand = lines[j]
-                    p = cand.split(',')
-                    if len(p) >= 4:
-                        try:
-                            vc = int(p[0])
-                            fc = int(p[2])
-                            current_submesh['vertex_count'] = vc
-                            current_submesh['face_count'] = fc
-                            found_counts = True
-                            break
-                        except Exception:
-                            continue
-                if not found_counts:
-                    current_submesh['vertex_count'] = None
-                    current_submesh['face_count'] = None
+                    if cand.count(b',') < 3:
+                        continue
+                    p = cand.decode('utf-8').split(',')
+                    try:
+                        vc = int(p[0])
+                        fc = int(p[2])
+                    except ValueError:
+                        continue
+                    current_submesh['vertex_count'] = vc
+                    current_submesh['face_count'] = fc
+                    break
+                else:
+                    count_scan_end = scan_end
 
             # Standard SMF vertices use 8 floats: position, extra per-vertex
             # data, and UV coordinates.
-            if len(parts) == 8:
-                if current_submesh is None:
-                    i += 1
-                    continue
-                try:
-                    v = [float(x) for x in parts]
-                    current_submesh["vertices"].append(v)
-                    self.vertices.append(v)
-                except ValueError:
-                    pass
-                i += 1
+            if comma_count == 7:
+                if current_submesh is not None:
+                    vert_rows_append(line)
                 continue
 
             # Faces are triangle index triplets into the current submesh.
-            if len(parts) == 3:
-                try:
-                    f = [int(x) for x in parts]
-                    if current_submesh:
-                        current_submesh["faces"].append(f)
-                except ValueError:
-                    pass
-                i += 1
+            if comma_count == 2:
+                if current_submesh:
+                    face_rows_append(line)
                 continue
 
-            # ---------------- Fallback: skip unknown line ----------------
-            i += 1
+            # Anything else is an unknown line and is skipped.
 
         # Flush the last active submesh when the file ends without another header.
         if current_submesh:
-            self.submeshes.append(current_submesh)
+            self._finish_submesh(current_submesh, vert_rows, face_rows)
+
+    # -------------------------------------------------------------------------
 
-        # Preserve first-seen ordering while collapsing duplicate texture refs.
-        for sm in self.submeshes:
-            sm["textures"] = list(dict.fromkeys(sm.get("textures", [])))
-        self.textures = list(dict.fromkeys(self.textures))
+    def parse(self, path: str) -> ParsedModel:
+        """
+        Parse an .SMF file into structured data.
+
+        Args:
+            path (str): Path to the SMF file.
+
+        Returns:
+            dict: A dictionary containing model metadata and geometry:
+                {
+                    "header": {...},
+                    "version": int,
+                    "vertices": [...],
+                    "submeshes": [...],
+                    "textures": [...]
+                }
+        """
+        self.submeshes = []
+        self.textures = []
+        self._texture_set = set()
+        self.version = None
+        self.header = {}
+
+        self._parse_lines(self._read_lines(path))
+        # Submeshes own their vertex blocks; the global array is one
+        # contiguous copy of them in file order.
+        self.vertices = np.concatenate(
+            [sm["vertices"] for sm in self.submeshes] or [np.empty((0, 8), dtype=np.float32)]
+        )
 
         # Return structured data
         return {
@@ -290,3 +411,80 @@ class SMFParser:
             "submeshes": self.submeshes,
             "textures": self.textures,
         }
+
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_dir() -> str:
+        """Return the directory used for cached parse results."""
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "pysmf")
+
+    @classmethod
+    def parse_cached(cls, path: str) -> ParsedModel:
+        """
+        Parse an .SMF file, reusing a cached result if the file is unchanged.
+
+        Entries are keyed by the resolved path, modification time, and size,
+        and only the most recently used entries are kept. Any cache problem
+        falls back to a normal parse.
+
+        Args:
+            path (str): Path to the SMF file.
+
+        Returns:
+            dict: The same structure returned by `parse`.
+        """
+        stat = os.stat(path)
+        key = f"{_PARSE_CACHE_VERSION}:{os.path.realpath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        cache_dir = cls._cache_dir()
+        cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".pkl")
+
+        try:
+            with open(cache_path, 'rb') as f:
+                model = pickle.load(f)
+        except Exception:
+            # Missing, corrupt, or incompatible entries are simply re-parsed.
+            pass
+        else:
+            # Touch the entry so eviction drops the least recently used files.
+            # A read-only cache still serves the loaded model.
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return model
+
+        model = cls().parse(path)
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            cls._evict_cache_entries(cache_dir)
+        except (OSError, pickle.PicklingError):
+            pass
+        return model
+
+    @staticmethod
+    def _evict_cache_entries(cache_dir: str) -> None:
+        """Delete the least recently used cache entries beyond the size limit."""
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(".pkl"):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+        entries.sort(reverse=True)
+        for _mtime, stale_path in entries[_PARSE_CACHE_MAX_ENTRIES:]:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                continue
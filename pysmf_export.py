@@ -7,11 +7,31 @@ Each SMF submesh is written as its own `o` section, preserving structure.
 The exporter is compatible with Blender and other 3D software.
 """
 
+import io
+
 import numpy as np
 
 from pysmf import SMFParser
 
 
+def _format_rows(row_format, rows):
+    """
+    Format every row of a 2D array with a single `%` operation.
+
+    Args:
+        row_format (str): Per-row template, e.g. `"v %s %s %s\n"`.
+        rows (np.ndarray): Values to substitute, one row per template copy.
+
+    Returns:
+        str: The formatted rows joined together.
+    """
+    if rows.dtype.kind == 'f':
+        # NumPy's string conversion keeps the shortest float32 repr;
+        # `tolist()` would widen to doubles and print float32 noise digits.
+        rows = rows.astype(str)
+    return (row_format * len(rows)) % tuple(rows.ravel().tolist())
+
+
 def export_to_obj(smf_path, obj_path):
     """
     Convert a .SMF file into a Wavefront .OBJ file.
@@ -23,58 +43,54 @@ def export_to_obj(smf_path, obj_path):
     Each SMF submesh becomes a separate OBJ object, maintaining
     the original subdivision structure. UVs are written if present.
     """
-    parser = SMFParser()
-    model = parser.parse(smf_path)
-
-    with open(obj_path, 'w') as f:
-        f.write("# Exported from Python-SMF Viewer\n")
-        f.write(f"# Source: {smf_path}\n\n")
-
-        # OBJ indices are file-global, so each submesh needs an accumulated offset.
-        vertex_offset = 0
-
-        for sm_index, sm in enumerate(model['submeshes']):
-            name = sm.get('name', f"Submesh_{sm_index}")
-            verts = np.array(sm['vertices'])
-            faces = sm['faces']
-            # Parsed SMF vertices expose UVs in slots 6/7 when present.
-            has_uv = (verts.ndim == 2 and verts.shape[1] >= 8)
-            vert_count = len(verts)
-
-            f.write(f"o {name}\n")
+    model = SMFParser.parse_cached(smf_path)
+
+    # Build the whole OBJ in memory so the file is written in one call.
+    out = io.StringIO()
+    out.write("# Exported from Python-SMF Viewer\n")
+    out.write(f"# Source: {smf_path}\n\n")
+
+    # OBJ indices are file-global, so each submesh needs an accumulated offset.
+    vertex_offset = 0
+
+    for sm_index, sm in enumerate(model['submeshes']):
+        name = sm.get('name', f"Submesh_{sm_index}")
+        verts = np.asarray(sm['vertices'])
+        faces = sm['faces']
+        # Parsed SMF vertices expose UVs in slots 6/7 when present.
+        has_uv = (verts.ndim == 2 and verts.shape[1] >= 8)
+        vert_count = len(verts)
+
+        out.write(f"o {name}\n")
+
+        # Write vertex positions
+        if vert_count > 0:
+            out.write(_format_rows("v %s %s %s\n", verts[:, :3]))
+
+        # Write texture coordinates if present (UVs)
+        if has_uv and vert_count > 0:
+            uvs = np.column_stack((verts[:, 6], 1.0 - verts[:, 7]))  # flip V for Blender
+            out.write(_format_rows("vt %s %s\n", uvs))
+
+        # Write triangle faces (OBJ indices start at 1)
+        if vert_count > 0 and len(faces) > 0:
+            faces_arr = np.asarray(faces).reshape(-1, 3)
+            # Skip malformed faces rather than writing broken OBJ topology.
+            valid = ((faces_arr >= 0) & (faces_arr < vert_count)).all(axis=1)
+            # The mask already produced a private copy, so offset it in place.
+            faces_arr = faces_arr[valid]
+            faces_arr += 1 + vertex_offset
+            if has_uv:
+                # Each index doubles as its UV index, so repeat it in place.
+                out.write(_format_rows("f %d/%d %d/%d %d/%d\n", faces_arr.repeat(2, axis=1)))
+            else:
+                out.write(_format_rows("f %d %d %d\n", faces_arr))
 
-            # Write vertex positions
-            for v in verts:
-                f.write(f"v {v[0]} {v[1]} {v[2]}\n")
+        vertex_offset += len(verts)
+        out.write("\n")
 
-            # Write texture coordinates if present (UVs)
-            if has_uv:
-                for v in verts:
-                    f.write(f"vt {v[6]} {1.0 - v[7]}\n")  # flip V for Blender
-
-            # Write triangle faces (OBJ indices start at 1)
-            if vert_count > 0:
-                for face in faces:
-                    if len(face) < 3:
-                        continue
-
-                    try:
-                        indices = [int(vi) for vi in face[:3]]
-                    except (TypeError, ValueError):
-                        continue
-
-                    # Skip malformed faces rather than writing broken OBJ topology.
-                    if any(vi < 0 or vi >= vert_count for vi in indices):
-                        continue
-
-                    i1, i2, i3 = [vi + 1 + vertex_offset for vi in indices]
-                    if has_uv:
-                        f.write(f"f {i1}/{i1} {i2}/{i2} {i3}/{i3}\n")
-                    else:
-                        f.write(f"f {i1} {i2} {i3}\n")
-
-            vertex_offset += len(verts)
-            f.write("\n")
+    with open(obj_path, 'w') as f:
+        f.write(out.getvalue())
 
     print(f"[✔] Export complete: {obj_path}")
 
@@ -9,12 +9,16 @@ from pysmf import ParsedModel
 
 @dataclass(slots=True)
 class PreparedSubmesh:
-    """Cached NumPy views used repeatedly during rendering."""
+    """Cached NumPy views and GL buffer handles used repeatedly during rendering."""
 
     vertices: np.ndarray | None
     positions: np.ndarray | None
     normals: np.ndarray | None
     light_factor: float
+    indices: np.ndarray | None = None
+    vertex_buffer: int | None = None
+    index_buffer: int | None = None
+    shadow_positions: np.ndarray | None = None
 
 
 def normalize_vector(vector: np.ndarray) -> np.ndarray:
@@ -25,9 +29,9 @@ def normalize_vector(vector: np.ndarray) -> np.ndarray:
     return (vector / length).astype(np.float32)
 
 
-def build_vertex_normals(vertices: list[list[float]], faces: list[list[int]]) -> np.ndarray | None:
+def build_vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray | None:
     """Build averaged per-vertex normals for a submesh."""
-    if not vertices:
+    if len(vertices) == 0:
         return None
 
     positions = np.array(vertices, dtype=np.float32)[:, :3]
@@ -62,6 +66,30 @@ def build_vertex_normals(vertices: list[list[float]], faces: list[list[int]]) ->
     return normals.astype(np.float32)
 
 
+def build_triangle_indices(faces: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Flatten in-range triangle faces into a `uint32` index array for GL draws."""
+    faces_arr = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    valid = ((faces_arr >= 0) & (faces_arr < vertex_count)).all(axis=1)
+    return np.ascontiguousarray(faces_arr[valid], dtype=np.uint32).ravel()
+
+
+def build_grid_line_vertices(grid_range: int, grid_y: float) -> np.ndarray:
+    """Build `GL_LINES` endpoints for a square ground grid centered on the origin."""
+    steps = np.arange(-grid_range, grid_range + 1, dtype=np.float32)
+    line_count = len(steps)
+    endpoints = np.empty((4 * line_count, 3), dtype=np.float32)
+    endpoints[:, 1] = grid_y
+    along_z = endpoints[: 2 * line_count]
+    along_z[:, 0] = np.repeat(steps, 2)
+    along_z[0::2, 2] = -grid_range
+    along_z[1::2, 2] = grid_range
+    along_x = endpoints[2 * line_count :]
+    along_x[0::2, 0] = -grid_range
+    along_x[1::2, 0] = grid_range
+    along_x[:, 2] = np.repeat(steps, 2)
+    return endpoints
+
+
 def compute_light_factor(
     normal: np.ndarray | None,
     light_direction: np.ndarray,
@@ -104,7 +132,7 @@ def prepare_submeshes(
     """Convert submesh vertices into cached arrays once per model load."""
     prepared: list[PreparedSubmesh] = []
     for submesh in model_data["submeshes"]:
-        if not submesh["vertices"]:
+        if len(submesh["vertices"]) == 0:
             prepared.append(PreparedSubmesh(vertices=None, positions=None, normals=None, light_factor=1.0))
             continue
         vertices = np.array(submesh["vertices"], dtype=np.float32)
@@ -115,6 +143,7 @@ def prepare_submeshes(
                 positions=vertices[:, :3],
                 normals=normals,
                 light_factor=compute_submesh_light_factor(normals, light_direction, ambient, diffuse_strength),
+                indices=build_triangle_indices(submesh["faces"], len(vertices)),
             )
         )
     return prepared
@@ -122,17 +151,22 @@ def prepare_submeshes(
 
 def compute_model_metrics(model_data: ParsedModel) -> tuple[np.ndarray, float, int, int]:
     """Compute center, size, vertex count, and face count for the loaded model."""
-    vertex_arrays = [
-        np.array(submesh["vertices"], dtype=np.float32)
-        for submesh in model_data["submeshes"]
-        if submesh["vertices"]
-    ]
-    if not vertex_arrays:
+    sizes = [len(submesh["vertices"]) for submesh in model_data["submeshes"]]
+    total_verts = sum(sizes)
+    if total_verts == 0:
         return np.zeros(3), 1.0, 0, 0
 
-    verts = np.concatenate(vertex_arrays, axis=0)
-    model_center = verts[:, :3].mean(axis=0)
-    model_size = float(np.linalg.norm(np.ptp(verts[:, :3], axis=0)))
-    total_verts = int(verts.shape[0])
+    # Only positions feed the metrics, so copy them straight into one
+    # preallocated buffer instead of concatenating full per-submesh arrays.
+    positions = np.empty((total_verts, 3), dtype=np.float32)
+    offset = 0
+    for submesh, count in zip(model_data["submeshes"], sizes):
+        if count == 0:
+            continue
+        positions[offset:offset + count] = np.asarray(submesh["vertices"], dtype=np.float32)[:, :3]
+        offset += count
+
+    model_center = positions.mean(axis=0)
+    model_size = float(np.linalg.norm(np.ptp(positions, axis=0)))
     total_faces = sum(len(sm["faces"]) for sm in model_data["submeshes"])
     return model_center, model_size, total_verts, total_faces
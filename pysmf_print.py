@@ -9,13 +9,17 @@ Reads a Terminal Reality .SMF file using SMFParser and prints a formatted summar
   - Textures per submesh
 """
 
-from pysmf import SMFParser
+from pysmf import ParsedModel, SMFParser
 
 
-def print_smf_summary(path: str):
-    """Parse an SMF file and print its contents in a readable format."""
-    parser = SMFParser()
-    data = parser.parse(path)
+def print_smf_summary(path: str, data: ParsedModel | None = None):
+    """
+    Print an SMF file's contents in a readable format.
+
+    Pass `data` when the model is already parsed to skip loading it again.
+    """
+    if data is None:
+        data = SMFParser.parse_cached(path)
 
     print("\n============================ SMF MODEL SUMMARY ============================")
     print(f"File: {path}")